@@ -1,96 +1,125 @@
 """Exploration script for discovering Solio settings interface."""
 
-import time
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 
 from playwright.sync_api import Page
 
-from .browser import create_browser_context
+from .browser import get_browser_context
 from .config import OUTPUT_DIR
 from .login import ensure_logged_in
+from .solve import wait_for_state
 
+# Horizon button is labelled like "1 GW" or "10 GWs"
+HORIZON_NAME = re.compile(r"^\d+\s+GWs?$")
 
-def explore_settings_interface(page: Page) -> None:
+# Snapshots are written in the background while the page is driven
+_writer = ThreadPoolExecutor(max_workers=2)
+
+# Visible Optimisation (solver) settings panel
+SOLVER_PANEL = '[role="tabpanel"][aria-labelledby*="solver"]'
+
+# Form controls listed when exploring a settings panel
+_CONTROLS_SELECTOR = (
+    'input, select, button[role="switch"], [role="slider"], '
+    '[role="checkbox"], [role="combobox"], textarea, label'
+)
+
+# Exploring is not time-critical, so give the UI longer to settle
+_WAIT_MS = 5000
+
+
+def _save_html(futures: list[Future], path: Path, html: str) -> None:
+    """Queue an HTML snapshot write and track it in futures."""
+    futures.append(_writer.submit(path.write_text, html, encoding="utf-8"))
+
+
+def explore_settings_interface(page: Page, dump_html: bool = False) -> None:
     """
     Explore the settings interface to see what options are available.
     This helps us understand what settings we can configure.
+
+    Args:
+        page: Playwright page that is already logged in to Solio.
+        dump_html: Save full-page HTML snapshots at each step (slow, large files).
     """
     print("\nExploring settings interface...")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    # Dialog locator is reused by every step below
+    dialog = page.locator('[role="dialog"]')
+    futures: list[Future] = []
     
     try:
         # First, try the settings wheel button using XPath
         print("\nLooking for settings wheel button via XPath...")
-        settings_wheel = page.locator('xpath=/html/body/div[1]/div/main/div[1]/div/div[4]/button')
+        settings_wheel = page.locator('xpath=/html/body/div[1]/div/main/div[1]/div/div[4]/button').first
         
-        if settings_wheel.count() > 0 and settings_wheel.is_visible():
+        if wait_for_state(settings_wheel, timeout=_WAIT_MS):
             print("Found settings wheel button, clicking...")
             settings_wheel.click()
-            time.sleep(1)
+            wait_for_state(dialog.first, timeout=_WAIT_MS)
             
             # Look for the dialog that opened
-            dialog = page.locator('[role="dialog"]')
             if dialog.count() > 0:
                 # First, click the "Settings" button to open the settings dialog
-                settings_button = dialog.locator('button:has-text("Settings")').first
+                settings_button = dialog.get_by_role("button", name="Settings").first
                 if settings_button.count() > 0:
                     print("Found 'Settings' button in dialog, clicking...")
                     settings_button.click()
-                    time.sleep(1.5)
                     
                     # Now look for the Optimisation tab (with wrench icon)
-                    optimisation_tab = page.locator('button[role="tab"]:has-text("Optimisation")').first
+                    optimisation_tab = page.get_by_role("tab", name="Optimisation").first
+                    wait_for_state(optimisation_tab, timeout=_WAIT_MS)
                     if optimisation_tab.count() > 0:
                         print("Found 'Optimisation' tab, clicking...")
                         optimisation_tab.click()
-                        time.sleep(1)
+                        tab_panel = page.locator(f"{SOLVER_PANEL}:not([hidden])")
+                        wait_for_state(tab_panel.first, timeout=_WAIT_MS)
                         
-                        # Now capture the optimisation settings content
-                        optimisation_content = page.content()
-                        optimisation_file = OUTPUT_DIR / f"optimisation_settings_{timestamp}.html"
-                        optimisation_file.write_text(optimisation_content, encoding="utf-8")
-                        print(f"Saved optimisation settings to: {optimisation_file}")
+                        # Now capture the optimisation settings content (dialog subtree only)
+                        if dump_html:
+                            optimisation_content = dialog.first.evaluate("el => el.outerHTML")
+                            optimisation_file = OUTPUT_DIR / f"optimisation_settings_{timestamp}.html"
+                            _save_html(futures, optimisation_file, optimisation_content)
+                            print(f"Saved optimisation settings to: {optimisation_file}")
                         
                         # Look for all controls in the optimisation tab
                         print("\nExploring controls in Optimisation tab:")
                         
-                        # Get the tab panel content
-                        tab_panel = page.locator('[role="tabpanel"][aria-labelledby*="solver"]')
-                        if tab_panel.count() > 0 and not tab_panel.get_attribute("hidden"):
-                            controls = tab_panel.locator('input, select, button[role="switch"], [role="slider"], [role="checkbox"], [role="combobox"], textarea, label').all()
-                            print(f"Found {len(controls)} controls in Optimisation tab:")
+                        # Get the tab panel content (the locator already excludes hidden panels)
+                        if tab_panel.count() > 0:
+                            # Serialize every control inside the browser in a single call
+                            controls = tab_panel.locator(_CONTROLS_SELECTOR).evaluate_all("""
+                                els => ({
+                                    total: els.length,
+                                    rows: els.slice(0, 50).map((el, i) => ({
+                                        type: el.getAttribute('type') || el.getAttribute('role') || el.tagName.toLowerCase(),
+                                        label: (el.getAttribute('aria-label') || el.getAttribute('name')
+                                            || el.getAttribute('placeholder') || (el.textContent || '').slice(0, 60)).trim()
+                                            || `control_${i}`,
+                                        value: el.getAttribute('value') || el.getAttribute('aria-valuenow')
+                                            || el.getAttribute('aria-checked') || el.getAttribute('data-state') || 'N/A',
+                                    })),
+                                })
+                            """)
+                            print(f"Found {controls['total']} controls in Optimisation tab:")
                             
-                            for i, elem in enumerate(controls[:50]):  # Show first 50
-                                try:
-                                    tag = elem.evaluate("el => el.tagName.toLowerCase()")
-                                    elem_type = elem.get_attribute("type") or elem.get_attribute("role") or tag
-                                    elem_label = (
-                                        elem.get_attribute("aria-label") 
-                                        or elem.get_attribute("name")
-                                        or elem.get_attribute("placeholder")
-                                        or elem.text_content()[:60] if elem.text_content() else f"control_{i}"
-                                    )
-                                    elem_value = (
-                                        elem.get_attribute("value") 
-                                        or elem.get_attribute("aria-valuenow") 
-                                        or elem.get_attribute("aria-checked")
-                                        or elem.get_attribute("data-state")
-                                        or "N/A"
-                                    )
-                                    print(f"  [{i}] {elem_label.strip()}: {elem_type} = {elem_value}")
-                                except Exception as e:
-                                    print(f"  [{i}] Error: {e}")
+                            for i, row in enumerate(controls["rows"]):  # Show first 50
+                                print(f"  [{i}] {row['label']}: {row['type']} = {row['value']}")
                         else:
                             print("Could not find visible Optimisation tab panel content")
                             # Just search for any visible settings-related controls
-                            controls = page.locator('[role="dialog"] input, [role="dialog"] select, [role="dialog"] button[role="switch"], [role="dialog"] [role="slider"]').all()
-                            print(f"Found {len(controls)} controls in dialog")
-                            for i, elem in enumerate(controls[:20]):
-                                try:
-                                    elem_label = elem.text_content()[:40] if elem.text_content() else f"control_{i}"
-                                    print(f"  [{i}] {elem_label.strip()}")
-                                except:
-                                    pass
+                            controls = dialog.locator('input, select, button[role="switch"], [role="slider"]').evaluate_all(
+                                "els => ({total: els.length, labels: els.slice(0, 20).map(el => el.textContent)})"
+                            )
+                            print(f"Found {controls['total']} controls in dialog")
+                            for i, text in enumerate(controls["labels"]):
+                                elem_label = text[:40] if text else f"control_{i}"
+                                print(f"  [{i}] {elem_label.strip()}")
                         
                         # Leave dialog open for inspection
                         print("\nOptimisation settings left open for manual inspection...")
@@ -99,10 +128,10 @@ def explore_settings_interface(page: Page) -> None:
                         print("'Optimisation' tab not found after opening Settings dialog")
                 else:
                     print("'Settings' button not found in dialog")
-                    # Capture what we got
-                    dialog_content = page.content()
+                    # Capture just the dialog subtree to see what we got
+                    dialog_content = dialog.first.evaluate("el => el.outerHTML")
                     dialog_file = OUTPUT_DIR / f"settings_wheel_dialog_{timestamp}.html"
-                    dialog_file.write_text(dialog_content, encoding="utf-8")
+                    _save_html(futures, dialog_file, dialog_content)
                     print(f"Saved settings wheel dialog to: {dialog_file}")
             else:
                 print("No dialog found after clicking settings wheel")
@@ -111,7 +140,7 @@ def explore_settings_interface(page: Page) -> None:
             print("Settings wheel button not found or not visible")
         
         # Look for settings button/tab
-        settings_button = page.locator('button[role="tab"]', has_text="Settings")
+        settings_button = page.get_by_role("tab", name="Settings")
         
         if not settings_button.is_visible():
             print("Settings tab not found or not visible")
@@ -119,71 +148,87 @@ def explore_settings_interface(page: Page) -> None:
         
         print("Found Settings tab")
         settings_button.click()
-        time.sleep(2)  # Wait for settings to load
+        settings_panel = page.locator('[role="tabpanel"]:not([hidden])').first
+        wait_for_state(settings_panel, timeout=_WAIT_MS)
         
-        # Capture the settings content
-        settings_content = page.content()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        settings_file = OUTPUT_DIR / f"settings_page_{timestamp}.html"
-        settings_file.write_text(settings_content, encoding="utf-8")
-        print(f"Saved settings page to: {settings_file}")
+        # Capture the settings content (visible tab panel only)
+        if dump_html:
+            settings_content = settings_panel.evaluate("el => el.outerHTML")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            settings_file = OUTPUT_DIR / f"settings_page_{timestamp}.html"
+            _save_html(futures, settings_file, settings_content)
+            print(f"Saved settings page to: {settings_file}")
         
         # Try to identify available settings
         # Look for input fields, sliders, dropdowns, etc.
-        inputs = page.locator('input, select, button[role="switch"]').all()
-        print(f"Found {len(inputs)} potential setting controls")
+        inputs = page.locator('input, select, button[role="switch"]').evaluate_all("""
+            els => ({
+                total: els.length,
+                rows: els.slice(0, 10).map(el => ({
+                    type: el.getAttribute('type'),
+                    name: el.getAttribute('name') || el.getAttribute('aria-label'),
+                })),
+            })
+        """)
+        print(f"Found {inputs['total']} potential setting controls")
         
-        for i, input_elem in enumerate(inputs[:10]):  # Show first 10
-            try:
-                elem_type = input_elem.get_attribute("type") or "unknown"
-                elem_name = input_elem.get_attribute("name") or input_elem.get_attribute("aria-label") or f"control_{i}"
-                print(f"  - {elem_name}: {elem_type}")
-            except Exception:
-                pass
+        for i, row in enumerate(inputs["rows"]):  # Show first 10
+            print(f"  - {row['name'] or f'control_{i}'}: {row['type'] or 'unknown'}")
         
         # Now explore the horizon setting (10 GWs button)
         print("\nExploring horizon setting...")
-        horizon_button = page.locator('button:has-text("GWs")').first
+        horizon_button = page.get_by_role("button", name=HORIZON_NAME).first
         if horizon_button.is_visible():
             print("Found horizon button, clicking to open dialog...")
             horizon_button.click()
-            time.sleep(1)  # Wait for dialog to open
+            wait_for_state(dialog.locator('[role="slider"]').first, timeout=_WAIT_MS)
             
             # Capture the horizon dialog
-            horizon_content = page.content()
-            horizon_file = OUTPUT_DIR / f"horizon_dialog_{timestamp}.html"
-            horizon_file.write_text(horizon_content, encoding="utf-8")
-            print(f"Saved horizon dialog to: {horizon_file}")
+            if dump_html:
+                horizon_content = dialog.first.evaluate("el => el.outerHTML")
+                horizon_file = OUTPUT_DIR / f"horizon_dialog_{timestamp}.html"
+                _save_html(futures, horizon_file, horizon_content)
+                print(f"Saved horizon dialog to: {horizon_file}")
             
             # Look for slider or input controls in the dialog
-            dialog = page.locator('[role="dialog"]')
             if dialog.count() > 0:
-                dialog_inputs = dialog.locator('input, [role="slider"]').all()
-                print(f"Found {len(dialog_inputs)} controls in horizon dialog:")
-                for i, elem in enumerate(dialog_inputs[:5]):
-                    try:
-                        elem_type = elem.get_attribute("type") or elem.get_attribute("role") or "unknown"
-                        elem_label = elem.get_attribute("aria-label") or elem.get_attribute("aria-valuetext") or f"control_{i}"
-                        elem_value = elem.get_attribute("value") or elem.get_attribute("aria-valuenow") or "N/A"
-                        print(f"  - {elem_label}: {elem_type} (value: {elem_value})")
-                    except Exception as e:
-                        print(f"  - Error reading control {i}: {e}")
+                dialog_inputs = dialog.locator('input, [role="slider"]').evaluate_all("""
+                    els => ({
+                        total: els.length,
+                        rows: els.slice(0, 5).map((el, i) => ({
+                            type: el.getAttribute('type') || el.getAttribute('role') || 'unknown',
+                            label: el.getAttribute('aria-label') || el.getAttribute('aria-valuetext') || `control_${i}`,
+                            value: el.getAttribute('value') || el.getAttribute('aria-valuenow') || 'N/A',
+                        })),
+                    })
+                """)
+                print(f"Found {dialog_inputs['total']} controls in horizon dialog:")
+                for row in dialog_inputs["rows"]:
+                    print(f"  - {row['label']}: {row['type']} (value: {row['value']})")
             
             # Close the dialog (press Escape or click outside)
             page.keyboard.press("Escape")
-            time.sleep(0.5)
+            wait_for_state(dialog.first, state="hidden", timeout=_WAIT_MS)
         else:
             print("Horizon button not found")
     
     except Exception as e:
         print(f"Error exploring settings: {e}")
+    finally:
+        # Surface any failed snapshot writes before returning
+        for future in futures:
+            try:
+                future.result()
+            except OSError as e:
+                print(f"Failed to save HTML snapshot: {e}")
 
 
 def main() -> None:
     """Run the settings exploration script."""
     print("Starting Solio settings exploration...")
     
-    p, context = create_browser_context(headless=True)
+    # Shared context is closed at exit; only this run's page is ours to close
+    p, context = get_browser_context(headless=True, block_assets=True)
     page = context.new_page()
     
     try:
@@ -191,12 +236,13 @@ def main() -> None:
             print("Failed to log in")
             return
         
-        # Wait for page to fully load
-        page.wait_for_load_state("networkidle", timeout=30000)
-        time.sleep(2)
+        # Wait for the DOM and the horizon button rather than network idle
+        page.wait_for_load_state("domcontentloaded")
+        horizon_button = page.get_by_role("button", name=HORIZON_NAME)
+        horizon_button.or_(page.locator('[role="dialog"]')).first.wait_for(timeout=15000)
         
-        # Run exploration
-        explore_settings_interface(page)
+        # Run exploration (set SOLIO_DEBUG_DUMP=1 to save full-page HTML)
+        explore_settings_interface(page, dump_html=os.environ.get("SOLIO_DEBUG_DUMP") == "1")
         
         print("\nExploration complete! Check the output/ directory for captured HTML.")
         print("Press Ctrl+C to exit...")
@@ -210,8 +256,7 @@ def main() -> None:
     except Exception as e:
         print(f"Error during exploration: {e}")
     finally:
-        context.close()
-        p.stop()
+        page.close()
 
 
 if __name__ == "__main__":
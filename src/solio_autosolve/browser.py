@@ -1,34 +1,240 @@
 """Browser management utilities."""
 
-from playwright.sync_api import BrowserContext, Playwright, sync_playwright
+import atexit
+import os
+import subprocess
+import time
+import urllib.request
+from pathlib import Path
 
-from .config import CHROME_PROFILE_DIR
+from dotenv import load_dotenv
+from playwright.sync_api import BrowserContext, Playwright, Route, sync_playwright
 
+from .config import CHROME_PROFILE_DIR, CHROME_PROFILE_DIR_STR
 
-def create_browser_context(headless: bool = False) -> tuple[Playwright, BrowserContext]:
+# Load SOLIO_CHROMIUM_PATH from .env for every entry point (solio-login,
+# solio-solve, debug scripts), so they all open the profile with the same binary
+load_dotenv()
+
+# System Chromium (e.g. on a Raspberry Pi) used when no path is configured
+SYSTEM_CHROMIUM = Path("/usr/bin/chromium")
+CHROMIUM_ARGS = ["--no-sandbox", "--disable-dev-shm-usage", "--window-size=1920,1080"]
+
+# Google Chrome binaries tried by the persistent browser when no Chromium is set
+CHROME_EXECUTABLES = (
+    "/opt/google/chrome/chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+)
+
+# Chrome writes the port it picked for --remote-debugging-port=0 here
+DEVTOOLS_PORT_FILE = CHROME_PROFILE_DIR / "DevToolsActivePort"
+
+# Requests aborted when block_assets is enabled. Stylesheets are kept:
+# visibility checks depend on them.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_HOSTS = (
+    "google-analytics",
+    "googletagmanager",
+    "doubleclick",
+    "hotjar",
+    "segment.io",
+    "segment.com",
+    "mixpanel",
+)
+
+# Shared (playwright, context) pairs handed out by get_browser_context,
+# keyed by the profile (user data dir) the context was launched with
+_singleton: dict[str, tuple[Playwright, BrowserContext]] = {}
+
+
+def _block_assets(route: Route) -> None:
+    """Abort requests that the automation never looks at."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        host in request.url for host in BLOCKED_HOSTS
+    ):
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _chromium_path() -> str | None:
+    """Return the configured or system Chromium binary, if any."""
+    chromium_path = os.environ.get("SOLIO_CHROMIUM_PATH")
+    if chromium_path or SYSTEM_CHROMIUM.exists():
+        return chromium_path or str(SYSTEM_CHROMIUM)
+    return None
+
+
+def create_browser_context(
+    headless: bool = False, block_assets: bool = False
+) -> tuple[Playwright, BrowserContext]:
     """
-    Create a Playwright browser context using real Chrome with persistent profile.
+    Create a Playwright browser context with the persistent profile.
+
+    Uses the Chromium binary from SOLIO_CHROMIUM_PATH or /usr/bin/chromium
+    when available, otherwise the installed Google Chrome channel.
 
     Args:
         headless: Run browser without visible window (default: False).
+        block_assets: Skip images, fonts, media and analytics requests.
 
     Returns:
         Tuple of (playwright, context) - caller must close both.
     """
-    print(f"Using persistent Chrome profile at: {CHROME_PROFILE_DIR}")
+    print(f"Using persistent Chrome profile at: {CHROME_PROFILE_DIR_STR}")
 
     p = sync_playwright().start()
 
-    context = p.chromium.launch_persistent_context(
-        user_data_dir=str(CHROME_PROFILE_DIR),
-        executable_path="/usr/bin/chromium",  # <-- use system Chromium on the Pi
-        headless=headless,
-        args=[
-            "--disable-blink-features=AutomationControlled",
-            "--no-sandbox",
-            "--disable-dev-shm-usage",
-            "--window-size=1920,1080",
+    launch_kwargs: dict = {
+        "user_data_dir": CHROME_PROFILE_DIR_STR,
+        "headless": headless,
+        "args": ["--disable-blink-features=AutomationControlled"],
+    }
+
+    chromium_path = _chromium_path()
+    if chromium_path:
+        launch_kwargs["executable_path"] = chromium_path
+        launch_kwargs["args"] += CHROMIUM_ARGS
+    else:
+        launch_kwargs["channel"] = "chrome"
+
+    context = p.chromium.launch_persistent_context(**launch_kwargs)
+
+    if block_assets:
+        context.route("**/*", _block_assets)
+
+    return p, context
+
+
+def _devtools_endpoint() -> str | None:
+    """Return the CDP endpoint of a running persistent browser, if any."""
+    try:
+        port = DEVTOOLS_PORT_FILE.read_text().split("\n", 1)[0].strip()
+        endpoint = f"http://127.0.0.1:{port}"
+        # The file outlives a crashed browser, so check something is listening
+        with urllib.request.urlopen(f"{endpoint}/json/version", timeout=1):
+            return endpoint
+    except (OSError, ValueError):
+        return None
+
+
+def _launch_persistent_browser(p: Playwright, headless: bool) -> str:
+    """Start Chromium detached from this process and return its CDP endpoint."""
+    executable = _chromium_path()
+    args = ["--disable-blink-features=AutomationControlled"]
+    if executable:
+        args += CHROMIUM_ARGS
+    else:
+        executable = next(
+            (path for path in CHROME_EXECUTABLES if Path(path).exists()),
+            p.chromium.executable_path,
+        )
+    if headless:
+        args.append("--headless=new")
+
+    DEVTOOLS_PORT_FILE.unlink(missing_ok=True)
+    subprocess.Popen(
+        [
+            executable,
+            f"--user-data-dir={CHROME_PROFILE_DIR_STR}",
+            "--remote-debugging-port=0",
+            *args,
+            "about:blank",
         ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
     )
 
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        endpoint = _devtools_endpoint()
+        if endpoint:
+            return endpoint
+        time.sleep(0.1)
+    raise RuntimeError(f"Browser did not start (no {DEVTOOLS_PORT_FILE.name} written)")
+
+
+def connect_persistent_browser(
+    headless: bool = True, block_assets: bool = False
+) -> tuple[Playwright, BrowserContext]:
+    """
+    Attach to the long-running browser for the persistent profile.
+
+    The browser is started on first use and left running when this process
+    exits, so later runs skip the Chromium launch and keep the warm page
+    cache. Callers must stop Playwright but must not close the context.
+
+    Args:
+        headless: Run browser without visible window (only used when starting it).
+        block_assets: Skip images, fonts, media and analytics requests while
+            this process is connected.
+
+    Returns:
+        Tuple of (playwright, context).
+    """
+    p = sync_playwright().start()
+
+    endpoint = _devtools_endpoint()
+    if endpoint:
+        print(f"Reusing running browser at {endpoint}")
+    else:
+        print(f"Starting persistent browser with profile at: {CHROME_PROFILE_DIR_STR}")
+        endpoint = _launch_persistent_browser(p, headless)
+
+    browser = p.chromium.connect_over_cdp(endpoint)
+    context = browser.contexts[0]
+    if block_assets:
+        context.route("**/*", _block_assets)
     return p, context
+
+
+def close_persistent_browser() -> bool:
+    """Shut down the persistent browser. Returns False if none was running."""
+    endpoint = _devtools_endpoint()
+    if not endpoint:
+        return False
+
+    with sync_playwright() as p:
+        browser = p.chromium.connect_over_cdp(endpoint)
+        try:
+            browser.new_browser_cdp_session().send("Browser.close")
+        except Exception:
+            pass  # The connection drops as the browser exits
+    DEVTOOLS_PORT_FILE.unlink(missing_ok=True)
+    return True
+
+
+def get_browser_context(
+    headless: bool = True, block_assets: bool = False
+) -> tuple[Playwright, BrowserContext]:
+    """
+    Return a browser context shared by every caller in this process.
+
+    The first call starts Playwright and launches the persistent profile;
+    later calls reuse the same pair. Both are closed automatically at exit,
+    so callers must not close them.
+
+    Args:
+        headless: Run browser without visible window (only used on first call).
+        block_assets: Skip non-essential requests (only used on first call).
+
+    Returns:
+        Tuple of (playwright, context).
+    """
+    if CHROME_PROFILE_DIR_STR not in _singleton:
+        p, context = create_browser_context(headless=headless, block_assets=block_assets)
+        _singleton[CHROME_PROFILE_DIR_STR] = (p, context)
+        atexit.register(_close_shared_context)
+    return _singleton[CHROME_PROFILE_DIR_STR]
+
+
+def _close_shared_context() -> None:
+    """Close the shared browser context and stop Playwright."""
+    pair = _singleton.pop(CHROME_PROFILE_DIR_STR, None)
+    if pair:
+        p, context = pair
+        context.close()
+        p.stop()
@@ -12,8 +12,12 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 CHROME_PROFILE_DIR = PROJECT_ROOT / "chrome_profile"
 OUTPUT_DIR = PROJECT_ROOT / "output"
 CREDENTIALS_DIR = PROJECT_ROOT / "credentials"
+PARSE_CACHE_DIR = OUTPUT_DIR / ".parse_cache"  # created on first write
 
 # Ensure directories exist
 CHROME_PROFILE_DIR.mkdir(exist_ok=True)
 OUTPUT_DIR.mkdir(exist_ok=True)
 CREDENTIALS_DIR.mkdir(exist_ok=True)
+
+# String form for Playwright's user_data_dir
+CHROME_PROFILE_DIR_STR = str(CHROME_PROFILE_DIR)
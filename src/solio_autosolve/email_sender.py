@@ -8,19 +8,107 @@ Supports two methods:
 import os
 import smtplib
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from typing import TypedDict
+from email.message import EmailMessage
+from email.policy import SMTP
+from functools import lru_cache
+from html import escape
+from operator import attrgetter
+from typing import TYPE_CHECKING, Iterator, TextIO, TypedDict
 
 from dotenv import load_dotenv
 
-from .parser import SolveResults, format_results_text, parse_results_file
 from .settings import load_solver_settings
 
+if TYPE_CHECKING:
+    from .parser import SolveResults
+
 # Load environment variables from .env file
 load_dotenv()
 
 
+# Static document head shared by every results email, kept as one flat
+# literal without source indentation
+_HTML_PREFIX = """<html>
+<head>
+<style>
+body { font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; }
+h1 { color: #1a472a; border-bottom: 2px solid #1a472a; padding-bottom: 10px; }
+.summary { background: #f5f5f5; padding: 15px; border-radius: 8px;
+  margin-bottom: 20px; }
+.summary p { margin: 5px 0; }
+.gameweek { border: 1px solid #ddd; border-radius: 8px; margin-bottom: 15px;
+  padding: 15px; }
+.gw-header { display: flex; justify-content: space-between;
+  margin-bottom: 10px; }
+.gw-title { font-size: 18px; font-weight: bold; }
+.grade { color: #059669; font-weight: bold; }
+.transfer { margin: 5px 0; padding: 8px; background: #e8f5e9;
+  border-radius: 4px; }
+.transfer-out { color: #c62828; }
+.transfer-in { color: #2e7d32; }
+.arrow { margin: 0 10px; color: #666; }
+.no-transfers { color: #666; font-style: italic; }
+</style>
+</head>
+<body>
+<h1>&#9917; Solio FPL Optimization Results</h1>
+"""
+
+_HTML_SUFFIX = """
+</body>
+</html>
+"""
+
+# Per-email templates; every interpolated value goes through _escape() first.
+# Markup is ASCII (entities for symbols) and carries no source indentation, so
+# lines stay under 78 characters for ordinary names and the HTML part goes out
+# as plain 7bit. A longer line only makes it quoted-printable, which every
+# client decodes.
+_SUMMARY_HTML = """
+<div class="summary">
+<p><strong>Total Projected Points:</strong> {total_points}</p>
+<p><strong>Total Transfers:</strong> {total_transfers}</p>
+{horizon_html}
+{disruption_html}
+</div>
+"""
+
+# Gameweek block is split around its transfers so rows stream straight out
+_GAMEWEEK_OPEN_HTML = """
+<div class="gameweek">
+<div class="gw-header">
+<span class="gw-title">{gameweek}</span>
+<span class="grade">{grade} ({points_range})</span>
+</div>
+<p>Transfers: {transfers_used} | Bank: &pound;{bank}m</p>
+"""
+
+_TRANSFER_ROW_HTML = """
+<div class="transfer">
+<span class="transfer-out">{out_player}</span>
+<span class="arrow">&rarr;</span>
+<span class="transfer-in">{in_player}</span>
+</div>
+"""
+
+_NO_TRANSFERS_HTML = '<p class="no-transfers">No transfers this week</p>'
+
+_GAMEWEEK_CLOSE_HTML = """
+</div>
+"""
+
+# Template fields read off each plan/transfer in one attrgetter call
+_GAMEWEEK_FIELDS = ("gameweek", "grade", "points_range", "transfers_used", "bank")
+_TRANSFER_FIELDS = ("out_player", "in_player")
+_get_gameweek_fields = attrgetter(*_GAMEWEEK_FIELDS)
+_get_transfer_fields = attrgetter(*_TRANSFER_FIELDS)
+
+
+def _escape(value: str) -> str:
+    """HTML-escape a value, writing any non-ASCII character as a reference."""
+    return escape(value).encode("ascii", "xmlcharrefreplace").decode("ascii")
+
+
 class EmailConfig(TypedDict):
     """Email configuration dictionary."""
 
@@ -28,16 +116,36 @@ class EmailConfig(TypedDict):
     email_password: str
     smtp_server: str
     smtp_port: int
+    send_html: bool
+
+
+@lru_cache(maxsize=1)
+def _load_gmail_api():
+    """Import the Gmail API module on first use (None if not installed).
+
+    The google client libraries are slow to import, so this is only paid
+    when an email is actually sent through the Gmail API.
+    """
+    try:
+        from . import gmail_api
+    except ImportError:
+        return None
+    return gmail_api
 
 
+@lru_cache(maxsize=1)
 def get_email_config() -> EmailConfig:
     """Get email configuration from environment variables.
 
+    The result is cached for the process; call get_email_config.cache_clear()
+    after changing the environment.
+
     Required environment variables:
         EMAIL_ADDRESS: Your email address (sender and recipient)
         EMAIL_PASSWORD: Your email password or app password
         SMTP_SERVER: SMTP server address (default: smtp.gmail.com)
         SMTP_PORT: SMTP server port (default: 587)
+        EMAIL_HTML: Set to 0 to send plain text only (default: 1)
 
     Returns:
         Dictionary with email configuration.
@@ -64,14 +172,19 @@ def get_email_config() -> EmailConfig:
         "email_password": email_password,
         "smtp_server": os.environ.get("SMTP_SERVER", "smtp.gmail.com"),
         "smtp_port": int(os.environ.get("SMTP_PORT", "587")),
+        "send_html": os.environ.get("EMAIL_HTML", "1") != "0",
     }
 
 
 def send_results_email(
-    results: SolveResults,
+    results: "SolveResults",
     recipient: str | None = None,
     subject: str | None = None,
     use_gmail_api: bool = True,
+    smtp_session: "SmtpSession | None" = None,
+    text_content: str | None = None,
+    html_content: str | None = None,
+    settings: dict | None = None,
 ) -> None:
     """Send optimization results via email.
 
@@ -82,6 +195,13 @@ def send_results_email(
         recipient: Email recipient (defaults to sender address from config).
         subject: Email subject (defaults to generated subject).
         use_gmail_api: Whether to try Gmail API first (default: True).
+        smtp_session: Open SMTP session to reuse for the fallback (batch sends).
+            If None, a one-off connection is used.
+        text_content: Already formatted plain text body (skips re-formatting).
+        html_content: Already formatted HTML body (skips re-formatting).
+            Ignored when EMAIL_HTML=0, which sends plain text only.
+        settings: Solver settings shown in the email (e.g. with CLI overrides
+            applied). If None, loads from solver_settings.yaml.
 
     Raises:
         ValueError: If email configuration is missing.
@@ -101,18 +221,27 @@ def send_results_email(
         else:
             subject = f"Solio FPL Optimization Results - {timestamp}"
 
-    # Prepare content
-    settings = load_solver_settings(verbose=False)
-    text_content = format_results_text(results, settings=settings)
-    html_content = format_results_html(results, settings)
+    # Prepare content, reusing anything the caller already formatted
+    if not config["send_html"]:
+        html_content = None
+    if text_content is None or (html_content is None and config["send_html"]):
+        if settings is None:
+            settings = load_solver_settings(verbose=False)
+        if text_content is None:
+            from .parser import format_results_text
+
+            text_content = format_results_text(results, settings=settings)
+        if html_content is None and config["send_html"]:
+            html_content = format_results_html(results, settings)
 
     # Try Gmail API first if enabled
-    if use_gmail_api:
+    gmail_api = _load_gmail_api() if use_gmail_api else None
+    if use_gmail_api and gmail_api is None:
+        print("Gmail API dependencies not installed, using SMTP...")
+    elif gmail_api is not None:
         try:
-            from .gmail_api import is_gmail_api_authorized, send_email_gmail_api
-
-            if is_gmail_api_authorized():
-                send_email_gmail_api(
+            if gmail_api.is_gmail_api_authorized():
+                gmail_api.send_email_gmail_api(
                     to=recipient,
                     subject=subject,
                     text_content=text_content,
@@ -121,13 +250,83 @@ def send_results_email(
                 return
             else:
                 print("Gmail API not authorized, falling back to SMTP...")
-        except ImportError:
-            print("Gmail API dependencies not installed, using SMTP...")
         except Exception as e:
             print(f"Gmail API failed ({e}), falling back to SMTP...")
 
     # Fall back to SMTP
-    _send_via_smtp(config, recipient, subject, text_content, html_content)
+    if smtp_session is not None:
+        smtp_session.send(recipient, subject, text_content, html_content)
+    else:
+        _send_via_smtp(config, recipient, subject, text_content, html_content)
+
+
+def _open_smtp(config: EmailConfig) -> smtplib.SMTP:
+    """Open an SMTP connection, upgrade it to TLS and log in."""
+    server = smtplib.SMTP(config["smtp_server"], config["smtp_port"])
+    try:
+        server.starttls()
+        server.login(config["email_address"], config["email_password"])
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+class SmtpSession:
+    """SMTP connection that stays authenticated across several sends.
+
+    The connection is opened on the first send and re-opened once if the
+    server has dropped it in the meantime.
+
+    Usage:
+        with SmtpSession(get_email_config()) as session:
+            for recipient in recipients:
+                session.send(recipient, subject, text_content, html_content)
+    """
+
+    def __init__(self, config: EmailConfig) -> None:
+        self.config = config
+        self._server: smtplib.SMTP | None = None
+
+    def __enter__(self) -> "SmtpSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure(self) -> smtplib.SMTP:
+        """Return the open connection, connecting and logging in if needed."""
+        if self._server is None:
+            self._server = _open_smtp(self.config)
+        return self._server
+
+    def close(self) -> None:
+        """Quit the SMTP connection if one is open."""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except smtplib.SMTPServerDisconnected:
+                pass
+            self._server = None
+
+    def send(
+        self,
+        recipient: str,
+        subject: str,
+        text_content: str,
+        html_content: str | None,
+    ) -> None:
+        """Send one email over the session's connection."""
+        try:
+            _send_via_smtp(
+                self.config, recipient, subject, text_content, html_content, server=self._ensure()
+            )
+        except smtplib.SMTPServerDisconnected:
+            # Server closed an idle connection - reconnect and retry once
+            self._server = None
+            _send_via_smtp(
+                self.config, recipient, subject, text_content, html_content, server=self._ensure()
+            )
 
 
 def _send_via_smtp(
@@ -135,7 +334,8 @@ def _send_via_smtp(
     recipient: str,
     subject: str,
     text_content: str,
-    html_content: str,
+    html_content: str | None,
+    server: smtplib.SMTP | None = None,
 ) -> None:
     """Send email via SMTP.
 
@@ -144,29 +344,33 @@ def _send_via_smtp(
         recipient: Email recipient.
         subject: Email subject.
         text_content: Plain text body.
-        html_content: HTML body.
+        html_content: HTML body, or None for a plain text only email.
+        server: Already authenticated connection to reuse. If None, a new
+            connection is opened and closed for this email.
     """
     sender = config["email_address"]
 
     # Create email message
-    msg = MIMEMultipart("alternative")
+    msg = EmailMessage(policy=SMTP)
     msg["Subject"] = subject
     msg["From"] = sender
     msg["To"] = recipient
 
-    msg.attach(MIMEText(text_content, "plain"))
-    msg.attach(MIMEText(html_content, "html"))
+    msg.set_content(text_content)
+    if html_content:
+        msg.add_alternative(html_content, subtype="html")
 
     # Send email
-    with smtplib.SMTP(config["smtp_server"], config["smtp_port"]) as server:
-        server.starttls()
-        server.login(sender, config["email_password"])
-        server.sendmail(sender, recipient, msg.as_string())
+    if server is None:
+        with _open_smtp(config) as server:
+            server.sendmail(sender, recipient, bytes(msg))
+    else:
+        server.sendmail(sender, recipient, bytes(msg))
 
     print(f"Email sent successfully via SMTP to {recipient}")
 
 
-def format_results_html(results: SolveResults, settings: dict | None = None) -> str:
+def format_results_html(results: "SolveResults", settings: dict | None = None) -> str:
     """Format results as HTML for email.
 
     Args:
@@ -176,91 +380,86 @@ def format_results_html(results: SolveResults, settings: dict | None = None) ->
     Returns:
         HTML formatted string.
     """
-    html_parts = [
-        """
-        <html>
-        <head>
-            <style>
-                body { font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto; }
-                h1 { color: #1a472a; border-bottom: 2px solid #1a472a; padding-bottom: 10px; }
-                .summary { background: #f5f5f5; padding: 15px; border-radius: 8px; margin-bottom: 20px; }
-                .summary p { margin: 5px 0; }
-                .gameweek { border: 1px solid #ddd; border-radius: 8px; margin-bottom: 15px; padding: 15px; }
-                .gw-header { display: flex; justify-content: space-between; margin-bottom: 10px; }
-                .gw-title { font-size: 18px; font-weight: bold; }
-                .grade { color: #059669; font-weight: bold; }
-                .transfer { margin: 5px 0; padding: 8px; background: #e8f5e9; border-radius: 4px; }
-                .transfer-out { color: #c62828; }
-                .transfer-in { color: #2e7d32; }
-                .arrow { margin: 0 10px; color: #666; }
-                .no-transfers { color: #666; font-style: italic; }
-            </style>
-        </head>
-        <body>
-            <h1>⚽ Solio FPL Optimization Results</h1>
-        """,
-        f"""
-            <div class="summary">
-                <p><strong>Total Projected Points:</strong> {results.total_points}</p>
-                <p><strong>Total Transfers:</strong> {results.total_transfers}</p>
-                {f'<p><strong>Horizon:</strong> {settings.get("horizon_weeks", "N/A")} GWs </p>' if settings else ''}
-                {f'<p><strong>Decision Disruption:</strong> {settings.get("decision_disruption_probability", "N/A"):.0%}</p>' if settings else ''}
-            </div>
-        """,
-    ]
+    return "".join(iter_results_html(results, settings))
+
+
+def format_results_html_stream(
+    results: "SolveResults", out: TextIO, settings: dict | None = None
+) -> None:
+    """Write results as HTML for email to a text stream.
+
+    Args:
+        results: Parsed solve results.
+        out: Text stream (file or buffer) the HTML is written to.
+        settings: Solver settings used for optimization (optional).
+    """
+    out.writelines(iter_results_html(results, settings))
+
+
+def iter_results_html(
+    results: "SolveResults", settings: dict | None = None
+) -> Iterator[str]:
+    """Yield the results email HTML fragment by fragment.
+
+    Args:
+        results: Parsed solve results.
+        settings: Solver settings used for optimization (optional).
+
+    Yields:
+        Consecutive pieces of the HTML document.
+    """
+    yield _HTML_PREFIX
+    yield _SUMMARY_HTML.format(
+        total_points=results.total_points,
+        total_transfers=results.total_transfers,
+        horizon_html=(
+            f'<p><strong>Horizon:</strong> {_escape(str(settings.get("horizon_weeks", "N/A")))} GWs </p>'
+            if settings else ''
+        ),
+        disruption_html=(
+            f'<p><strong>Decision Disruption:</strong> {settings.get("decision_disruption_probability", "N/A"):.0%}</p>'
+            if settings else ''
+        ),
+    )
 
     for plan in results.gameweek_plans:
-        transfers_html = ""
+        yield _GAMEWEEK_OPEN_HTML.format_map(
+            dict(zip(_GAMEWEEK_FIELDS, map(_escape, _get_gameweek_fields(plan))))
+        )
+
         if plan.transfers:
             for t in plan.transfers:
-                transfers_html += f"""
-                    <div class="transfer">
-                        <span class="transfer-out">{t.out_player}</span>
-                        <span class="arrow">→</span>
-                        <span class="transfer-in">{t.in_player}</span>
-                    </div>
-                """
+                yield _TRANSFER_ROW_HTML.format_map(
+                    dict(zip(_TRANSFER_FIELDS, map(_escape, _get_transfer_fields(t))))
+                )
         else:
-            transfers_html = '<p class="no-transfers">No transfers this week</p>'
-
-        html_parts.append(f"""
-            <div class="gameweek">
-                <div class="gw-header">
-                    <span class="gw-title">{plan.gameweek}</span>
-                    <span class="grade">{plan.grade} ({plan.points_range})</span>
-                </div>
-                <p>Transfers: {plan.transfers_used} | Bank: £{plan.bank}m</p>
-                {transfers_html}
-            </div>
-        """)
+            yield _NO_TRANSFERS_HTML
 
-    html_parts.append("""
-        </body>
-        </html>
-    """)
+        yield _GAMEWEEK_CLOSE_HTML
 
-    return "".join(html_parts)
+    yield _HTML_SUFFIX
 
 
 def main() -> None:
     """Send the most recent results via email."""
     from .config import OUTPUT_DIR
+    from .parser import find_latest_results_file, format_results_text, parse_results_file
 
     # Find most recent results file
-    result_files = list(OUTPUT_DIR.glob("results_*.html"))
-    if not result_files:
+    latest_file = find_latest_results_file(OUTPUT_DIR)
+    if latest_file is None:
         print("No results files found in output directory.")
         return
 
-    latest_file = max(result_files, key=lambda f: f.stat().st_mtime)
     print(f"Parsing: {latest_file}")
 
     results = parse_results_file(latest_file)
-    print(format_results_text(results))
+    text_content = format_results_text(results)
+    print(text_content)
     print()
 
     try:
-        send_results_email(results)
+        send_results_email(results, text_content=text_content)
     except ValueError as e:
         print(f"Configuration error: {e}")
     except smtplib.SMTPException as e:
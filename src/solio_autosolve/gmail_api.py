@@ -5,10 +5,10 @@ Tokens are stored locally and auto-refresh, so authentication is only
 needed once.
 """
 
-import base64
 import os
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from email.message import EmailMessage
+from email.policy import SMTP
+from functools import lru_cache
 
 from google.auth.external_account_authorized_user import (
     Credentials as ExternalCredentials,
@@ -18,6 +18,7 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaInMemoryUpload
 
 from .config import CREDENTIALS_DIR
 
@@ -28,6 +29,33 @@ SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 CREDENTIALS_FILE = CREDENTIALS_DIR / "credentials.json"
 TOKEN_FILE = CREDENTIALS_DIR / "token.json"
 
+# Parsed token.json, reloaded only when the file's mtime changes
+_token_cache: dict = {}
+
+
+def _load_token() -> Credentials | None:
+    """Load the saved token, reusing the parsed copy while the file is unchanged.
+
+    Returns:
+        Credentials from token.json, or None if no token has been saved.
+    """
+    try:
+        mtime_ns = TOKEN_FILE.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _token_cache.get("mtime_ns") != mtime_ns:
+        _token_cache["creds"] = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+        _token_cache["mtime_ns"] = mtime_ns
+    return _token_cache["creds"]
+
+
+def _save_token(creds: Credentials | ExternalCredentials) -> None:
+    """Write the token to disk and keep it as the cached copy."""
+    TOKEN_FILE.write_text(creds.to_json())
+    _token_cache["creds"] = creds
+    _token_cache["mtime_ns"] = TOKEN_FILE.stat().st_mtime_ns
+
 
 def get_gmail_credentials() -> Credentials | ExternalCredentials:
     """Get or refresh Gmail API credentials.
@@ -41,11 +69,8 @@ def get_gmail_credentials() -> Credentials | ExternalCredentials:
     Raises:
         FileNotFoundError: If credentials.json is not found.
     """
-    creds: Credentials | ExternalCredentials | None = None
-
     # Check for existing token
-    if TOKEN_FILE.exists():
-        creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+    creds: Credentials | ExternalCredentials | None = _load_token()
 
     # If no valid credentials, get new ones
     if not creds or not creds.valid:
@@ -73,12 +98,23 @@ def get_gmail_credentials() -> Credentials | ExternalCredentials:
             creds = flow.run_local_server(port=0)
 
         # Save token for future runs
-        TOKEN_FILE.write_text(creds.to_json())
+        _save_token(creds)
         print(f"Gmail API token saved to: {TOKEN_FILE}")
 
     return creds
 
 
+@lru_cache(maxsize=1)
+def _get_service():
+    """Build the Gmail API service once per process.
+
+    The service keeps the credentials and refreshes them on demand, so the
+    token file and discovery document are only loaded the first time.
+    """
+    creds = get_gmail_credentials()
+    return build("gmail", "v1", credentials=creds)
+
+
 def send_email_gmail_api(
     to: str,
     subject: str,
@@ -97,29 +133,25 @@ def send_email_gmail_api(
         HttpError: If the Gmail API request fails.
         FileNotFoundError: If credentials are not set up.
     """
-    creds = get_gmail_credentials()
-    service = build("gmail", "v1", credentials=creds)
+    service = _get_service()
 
     # Create message
-    if html_content:
-        msg = MIMEMultipart("alternative")
-        msg.attach(MIMEText(text_content, "plain"))
-        msg.attach(MIMEText(html_content, "html"))
-    else:
-        msg = MIMEText(text_content, "plain")
-
+    msg = EmailMessage(policy=SMTP)
     msg["To"] = to
     msg["Subject"] = subject
+    msg.set_content(text_content)
+    if html_content:
+        msg.add_alternative(html_content, subtype="html")
 
-    # Encode message
-    encoded_message = base64.urlsafe_b64encode(msg.as_bytes()).decode()
+    # Upload the raw RFC 822 bytes as media rather than a base64 "raw" field
+    media = MediaInMemoryUpload(bytes(msg), mimetype="message/rfc822")
 
     # Send via Gmail API
     try:
         message = (
             service.users()
             .messages()
-            .send(userId="me", body={"raw": encoded_message})
+            .send(userId="me", body={}, media_body=media)
             .execute()
         )
         print(f"Email sent successfully via Gmail API (Message ID: {message['id']})")
@@ -143,16 +175,15 @@ def is_gmail_api_authorized() -> bool:
     Returns:
         True if token.json exists and is valid, False otherwise.
     """
-    if not TOKEN_FILE.exists():
-        return False
-
     try:
-        creds = Credentials.from_authorized_user_file(str(TOKEN_FILE), SCOPES)
+        creds = _load_token()
+        if creds is None:
+            return False
         if creds.valid:
             return True
         if creds.expired and creds.refresh_token:
             creds.refresh(Request())
-            TOKEN_FILE.write_text(creds.to_json())
+            _save_token(creds)
             return True
     except Exception:
         return False
@@ -160,6 +191,16 @@ def is_gmail_api_authorized() -> bool:
     return False
 
 
+def warm_gmail_service() -> None:
+    """Load credentials and build the Gmail API service ahead of sending.
+
+    Does nothing unless a token already exists, so it never starts the
+    interactive OAuth flow. Safe to call from a background thread.
+    """
+    if is_gmail_api_authorized():
+        _get_service()
+
+
 def authorize_gmail_api() -> None:
     """Interactively authorize Gmail API access.
 
@@ -2,26 +2,59 @@
 
 import time
 
-from playwright.sync_api import BrowserContext, Page
+from playwright.sync_api import BrowserContext, Page, expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from .browser import create_browser_context
 from .config import OUTPUT_DIR, SOLIO_URL
 
+# Auth cookie set by Solio once the Google login has completed
+SESSION_COOKIE_NAME = "session"
+SESSION_COOKIE_DOMAIN = "solioanalytics.com"
 
-def is_logged_in(page: Page) -> bool:
-    """Check if we're already logged in by seeing if the login dialog is NOT present."""
+# Login modal shown to signed-out visitors
+LOGIN_DIALOG_SELECTOR = '[data-slot="dialog-content"]'
+
+# How long the login dialog gets to appear, with and without a session cookie
+DIALOG_TIMEOUT_WITH_COOKIE_MS = 3000
+DIALOG_TIMEOUT_MS = 10000
+
+
+def has_session_cookie(context: BrowserContext) -> bool:
+    """Check the profile for an unexpired Solio session cookie."""
+    now = time.time()
+    for cookie in context.cookies():
+        if (
+            cookie["name"] == SESSION_COOKIE_NAME
+            and cookie["domain"].endswith(SESSION_COOKIE_DOMAIN)
+            and (cookie["expires"] == -1 or cookie["expires"] > now)
+        ):
+            return True
+    return False
+
+
+def is_logged_in(page: Page, dialog_timeout_ms: int = DIALOG_TIMEOUT_MS) -> bool:
+    """Check if we're already logged in by seeing if the login dialog is NOT present.
+
+    Args:
+        page: Page that has navigated to Solio.
+        dialog_timeout_ms: How long the login dialog gets to appear. The
+            modal can mount after the solver UI, so it is the dialog itself
+            that is waited on, not the Optimise button.
+    """
     try:
-        # Give the page more time to load and process auth state
-        page.wait_for_load_state("networkidle", timeout=15000)
-        time.sleep(2)  # Extra wait for JS to process auth
-
-        # If the login dialog is visible, we're not logged in
-        dialog = page.locator('[data-slot="dialog-content"]')
-        if dialog.is_visible():
-            # Double-check - sometimes dialog appears briefly
-            time.sleep(1)
-            if dialog.is_visible():
-                return False
+        # Solio keeps connections open, so networkidle can take the whole
+        # timeout; the DOM plus the dialog check is enough
+        page.wait_for_load_state("domcontentloaded", timeout=15000)
+        dialog = page.locator(LOGIN_DIALOG_SELECTOR)
+        try:
+            dialog.wait_for(state="visible", timeout=dialog_timeout_ms)
+        except PlaywrightTimeoutError:
+            return True  # The login dialog never showed up
+
+        # If the login dialog stays visible, we're not logged in.
+        # Sometimes it appears briefly, so give it a moment to go away.
+        dialog.wait_for(state="hidden", timeout=5000)
         return True
     except Exception:
         return False
@@ -34,7 +67,7 @@ def login_to_solio(page: Page, context: BrowserContext) -> bool:
     """
     # Wait for the login dialog to appear
     print("Waiting for login dialog...")
-    page.wait_for_selector('[data-slot="dialog-content"]', timeout=10000)
+    page.wait_for_selector(LOGIN_DIALOG_SELECTOR, timeout=10000)
 
     # Step 1: Accept the terms checkbox
     print("Accepting terms...")
@@ -45,26 +78,25 @@ def login_to_solio(page: Page, context: BrowserContext) -> bool:
     print("Waiting for Google login button to be enabled...")
     google_button = page.get_by_role("button", name="Log in with Google")
 
-    # Poll until the button is enabled
-    max_wait = 5  # seconds
-    start_time = time.time()
-    while time.time() - start_time < max_wait:
-        if google_button.is_enabled():
-            break
-        time.sleep(0.1)
-    else:
+    try:
+        expect(google_button).to_be_enabled(timeout=5000)
+    except AssertionError:
         print("Google button did not become enabled in time")
         return False
 
     # Step 3: Click the Google login button and handle the popup or redirect
+    # The waiter is set up before the click, so a popup opened by the click
+    # handler itself is not missed; no popup within 2s means a redirect
     print("Clicking Google login button...")
-    google_button.click()
-
-    # Wait for either a popup or a redirect to Google
-    time.sleep(2)
+    try:
+        with context.expect_page(timeout=2000) as popup_info:
+            google_button.click()
+        popup_page = popup_info.value
+    except PlaywrightTimeoutError:
+        popup_page = None
 
     # Check if we got redirected (URL changed from Solio)
-    if "google" in page.url.lower() or "accounts.google" in page.url.lower():
+    if popup_page is None and "google" in page.url.lower():
         print("Redirected to Google login page...")
         print("Please complete Google login in the browser...")
         try:
@@ -72,42 +104,27 @@ def login_to_solio(page: Page, context: BrowserContext) -> bool:
             print("Redirected back to Solio!")
         except Exception as e:
             print(f"Waiting for redirect: {e}")
+    elif popup_page is not None:
+        print("Google OAuth popup detected!")
+        print("Please complete the Google login in the popup window...")
+        try:
+            if not popup_page.is_closed():
+                popup_page.wait_for_event("close", timeout=180000)  # 3 minutes
+            print("Google popup closed!")
+        except Exception as e:
+            print(f"Popup handling: {e}")
     else:
-        # Check if there's a popup
-        pages = context.pages
-        if len(pages) > 1:
-            popup_page = pages[-1]
-            print("Google OAuth popup detected!")
-            print("Please complete the Google login in the popup window...")
-            try:
-                # Wait for the popup to close by polling
-                max_wait = 180  # 3 minutes
-                start = time.time()
-                while time.time() - start < max_wait:
-                    if popup_page.is_closed():
-                        break
-                    time.sleep(0.5)
-                print("Google popup closed!")
-            except Exception as e:
-                print(f"Popup handling: {e}")
-        else:
-            print("Waiting for authentication to complete...")
-
-    # Give the main page time to process the auth callback
-    time.sleep(3)
+        print("Waiting for authentication to complete...")
 
     # Wait for the dialog to close after successful login
     try:
-        page.wait_for_selector(
-            '[data-slot="dialog-content"]', state="hidden", timeout=30000
-        )
+        page.wait_for_selector(LOGIN_DIALOG_SELECTOR, state="hidden", timeout=30000)
         print("Login successful! Dialog closed.")
         return True
     except Exception as e:
         # Check if we're actually logged in despite the dialog check
         page.reload()
-        time.sleep(2)
-        if not page.locator('[data-slot="dialog-content"]').is_visible():
+        if is_logged_in(page):
             print("Login successful after reload!")
             return True
         print(f"Login may have failed or timed out: {e}")
@@ -119,7 +136,12 @@ def ensure_logged_in(page: Page, context: BrowserContext) -> bool:
     print(f"Navigating to {SOLIO_URL}...")
     page.goto(SOLIO_URL)
 
-    if is_logged_in(page):
+    # A live session cookie only shortens the dialog check: the server may
+    # already have expired the session, so the page is still checked
+    dialog_timeout_ms = (
+        DIALOG_TIMEOUT_WITH_COOKIE_MS if has_session_cookie(context) else DIALOG_TIMEOUT_MS
+    )
+    if is_logged_in(page, dialog_timeout_ms):
         print("Already logged in from saved session!")
         return True
     else:
@@ -143,10 +165,16 @@ def main():
 
     try:
         if ensure_logged_in(page, context):
-            # Wait for page to fully load
+            # Wait for the solver UI rather than networkidle, which Solio's
+            # open connections can hold off for the whole timeout
             print("Waiting for page to fully load...")
-            page.wait_for_load_state("networkidle", timeout=30000)
-            time.sleep(2)
+            page.wait_for_load_state("domcontentloaded", timeout=30000)
+            try:
+                page.get_by_role("button", name="Optimise").wait_for(
+                    state="visible", timeout=10000
+                )
+            except PlaywrightTimeoutError:
+                print("Optimise button did not appear, saving the page as it is...")
 
             # Capture and save the HTML
             html_content = page.content()
@@ -9,19 +9,25 @@ This script performs the complete workflow:
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
-from .browser import create_browser_context
-from .email_sender import send_results_email
-from .login import ensure_logged_in
-from .parser import format_results_text, parse_results_file
-from .solve import run_solve_on_page
+from .parser import find_latest_results_file, format_results_text, parse_results_file
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+def _warm_up_email() -> None:
+    """Get Gmail API credentials ready while the browser does its work."""
+    try:
+        from .gmail_api import warm_gmail_service
+    except ImportError:
+        return
+    warm_gmail_service()
+
+
 def main() -> int:
     """Run the complete Solio automation workflow.
 
@@ -58,11 +64,47 @@ def main() -> int:
         metavar="probability",
         help="Override decision disruption probability (0.0-1.0)",
     )
+    parser.add_argument(
+        "--persistent",
+        action="store_true",
+        help="Keep the browser running after the solve and reuse it on later runs",
+    )
+    parser.add_argument(
+        "--stop-browser",
+        action="store_true",
+        help="Shut down the browser left running by --persistent, then exit",
+    )
+    parser.add_argument(
+        "--no-save-html",
+        action="store_true",
+        help="Don't save the results page HTML to output/ unless it is needed for parsing",
+    )
     args = parser.parse_args()
 
+    if args.stop_browser:
+        from .browser import close_persistent_browser
+
+        if close_persistent_browser():
+            print("Persistent browser stopped.")
+        else:
+            print("No persistent browser running.")
+        return 0
+
     results_file = None
+    solve_results = None
+
+    # Token refresh and service discovery are network bound and independent
+    # of the browser, which has to stay on this thread (sync Playwright).
+    warmup = ThreadPoolExecutor(max_workers=1)
+    if not args.no_email:
+        warmup.submit(_warm_up_email)
 
     if not args.no_solve:
+        # Playwright is only needed when solving, so --no-solve skips loading it
+        from .browser import connect_persistent_browser, create_browser_context
+        from .login import ensure_logged_in
+        from .solve import run_solve_on_page
+
         print("=" * 50)
         print("SOLIO FPL AUTOMATION")
         print("=" * 50)
@@ -70,8 +112,16 @@ def main() -> int:
 
         # Create browser context
         print("Starting browser...")
-        # Default to headless unless --gui flag is used
-        playwright, context = create_browser_context(headless=not args.gui)
+        # Default to headless unless --gui flag is used. Images, fonts and
+        # analytics play no part in the solve, so they are not fetched.
+        if args.persistent:
+            playwright, context = connect_persistent_browser(
+                headless=not args.gui, block_assets=True
+            )
+        else:
+            playwright, context = create_browser_context(
+                headless=not args.gui, block_assets=True
+            )
 
         try:
             page = context.pages[0] if context.pages else context.new_page()
@@ -92,18 +142,29 @@ def main() -> int:
             if args.ddp is not None:
                 settings_overrides['decision_disruption_probability'] = args.ddp
             
-            solve_results = run_solve_on_page(page, settings_overrides=settings_overrides)
-
-            if not solve_results or "output_file" not in solve_results:
+            solve_results = run_solve_on_page(
+                page,
+                settings_overrides=settings_overrides,
+                capture_html=not args.no_save_html,
+            )
+
+            if not solve_results or not (
+                "parsed" in solve_results or solve_results.get("output_file")
+            ):
                 print("ERROR: Solve failed or no results captured")
                 return 1
 
             results_file = solve_results["output_file"]
 
         finally:
-            context.close()
-            playwright.stop()
-            print("Browser closed.")
+            if args.persistent:
+                # Only disconnect; the browser stays up for the next run
+                playwright.stop()
+                print("Disconnected from browser (left running).")
+            else:
+                context.close()
+                playwright.stop()
+                print("Browser closed.")
 
     # Step 4: Parse and display results
     print()
@@ -111,33 +172,41 @@ def main() -> int:
 
     # Get actual settings used (from solve_results if available)
     actual_settings = None
-    if results_file and 'settings' in (solve_results or {}):
+    if solve_results and 'settings' in solve_results:
         actual_settings = solve_results.get('settings')
     
-    if results_file:
+    if solve_results and "parsed" in solve_results:
+        # Already read from the live page by fetch_results
+        results = solve_results["parsed"]
+    elif results_file:
         results = parse_results_file(results_file)
     else:
         # Find most recent results file
         from .config import OUTPUT_DIR
 
-        result_files = list(OUTPUT_DIR.glob("results_*.html"))
-        if not result_files:
+        latest_file = find_latest_results_file(OUTPUT_DIR)
+        if latest_file is None:
             print("ERROR: No results files found")
             return 1
 
-        latest_file = max(result_files, key=lambda f: f.stat().st_mtime)
         print(f"Using most recent results: {latest_file}")
         results = parse_results_file(latest_file)
 
+    text_content = format_results_text(results, settings=actual_settings)
     print()
-    print(format_results_text(results, settings=actual_settings))
+    print(text_content)
 
     # Step 5: Send email
+    warmup.shutdown(wait=True)
     if not args.no_email:
+        from .email_sender import send_results_email
+
         print()
         print("Sending email...")
         try:
-            send_results_email(results)
+            send_results_email(
+                results, text_content=text_content, settings=actual_settings
+            )
         except ValueError as e:
             print(f"Email configuration error: {e}")
             return 1
@@ -1,13 +1,134 @@
 """Parse Solio optimization results HTML to extract transfer recommendations."""
 
+import gzip
+import os
+import pickle
 import re
 from dataclasses import dataclass, field
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .settings import load_solver_settings
 
+# lxml's C parser builds the tree much faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:
+    _HTML_PARSER = "html.parser"
+
+# Only the summary and plan nodes (and their subtrees) are ever read, so the
+# rest of the page (scripts, styles, navigation) is never built into the tree
+_RESULTS_STRAINER = SoupStrainer("div", class_=re.compile(r"evaluationNode|planNode"))
+
+# Bump when parsing changes so stale cached results are not reused
+_PARSE_CACHE_VERSION = 7
+
+_FLOAT_RE = re.compile(r"[\d.]+")
+_INT_RE = re.compile(r"\d+")
+
+# class_ matchers, built once instead of a new lambda per find() call
+_EVALUATION_NODE_CLASS = re.compile(r"evaluationNode")
+_PLAN_NODE_CLASS = re.compile(r"planNode")
+_TRANSFER_BLOCK_CLASS = re.compile(r"max-w-22")
+_OUT_PLAYERS_CLASS = re.compile(r"opacity-50")
+_ARROW_DOWN_CLASS = re.compile(r"arrow-down")
+
+
+def _is_gw_title(value: str | None) -> bool:
+    return bool(value and "text-lg" in value and "font-light" in value)
+
+
+def _is_grade(value: str | None) -> bool:
+    return bool(value and "text-2xl" in value and "font-semibold" in value)
+
+
+# Transfers/bank rows: one selector pass instead of a find_parent() walk per <p>
+_INFO_ROW_SELECTOR = "div.flex.gap-2 p.flex"
+
+
+# The same extraction as parse_results_html, run inside the live results page
+# with page.evaluate(); its return value is passed to build_results(). Keep the
+# selectors here in step with the matchers above.
+RESULTS_EXTRACTION_JS = """
+() => {
+    // Equivalent of BeautifulSoup's get_text(strip=True) on the saved HTML.
+    // React renders "{used} / {max}" as adjacent Text nodes, which become one
+    // string once serialized, so merge them (on a copy) before trimming.
+    const text = (el) => {
+        const copy = el.cloneNode(true);
+        copy.normalize();
+        const walker = document.createTreeWalker(copy, NodeFilter.SHOW_TEXT);
+        const parts = [];
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const tag = node.parentElement && node.parentElement.tagName;
+            if (tag === "SCRIPT" || tag === "STYLE") continue;
+            const part = node.nodeValue.trim();
+            if (part) parts.push(part);
+        }
+        return parts.join("");
+    };
+    const nextDiv = (el) => {
+        let sib = el.nextElementSibling;
+        while (sib && sib.tagName !== "DIV") sib = sib.nextElementSibling;
+        return sib;
+    };
+
+    const fields = {points: null, summary: [], plans: []};
+
+    const evalNode = document.querySelector('div[class*="evaluationNode"]');
+    if (evalNode) {
+        const pts = evalNode.querySelector("span.text-2xl");
+        if (pts) fields.points = text(pts);
+        for (const p of evalNode.querySelectorAll("p.flex")) {
+            const svg = p.querySelector("svg");
+            if (svg) fields.summary.push([svg.getAttribute("class") || "", text(p)]);
+        }
+    }
+
+    for (const node of document.querySelectorAll('div[class*="planNode"]')) {
+        const gw = node.querySelector('p[class*="text-lg"][class*="font-light"]');
+        if (!gw) continue;
+
+        const grade = node.querySelector('span[class*="text-2xl"][class*="font-semibold"]');
+        const gradeLine = grade && grade.parentElement
+            ? grade.parentElement.closest("span") : null;
+
+        const info = [];
+        for (const p of node.querySelectorAll("div.flex.gap-2 p.flex")) {
+            const svg = p.querySelector("svg");
+            info.push([svg ? svg.getAttribute("aria-label") : null, text(p)]);
+        }
+
+        let outPlayers = [];
+        let inPlayers = [];
+        const transferDiv = node.querySelector('div[class*="max-w-22"]');
+        if (transferDiv) {
+            const outDiv = transferDiv.querySelector('div[class*="opacity-50"]');
+            if (outDiv) outPlayers = [...outDiv.querySelectorAll("p")].map(text);
+            const arrow = transferDiv.querySelector('svg[class*="arrow-down"]');
+            const inDiv = arrow ? nextDiv(arrow) : null;
+            if (inDiv) inPlayers = [...inDiv.querySelectorAll("p")].map(text);
+        }
+
+        fields.plans.push({
+            gameweek: text(gw),
+            grade: grade ? text(grade) : "",
+            grade_line: gradeLine ? text(gradeLine) : null,
+            info: info,
+            out: outPlayers,
+            in: inPlayers,
+        });
+    }
+
+    return fields;
+}
+"""
+
 
 @dataclass
 class Transfer:
@@ -27,6 +148,7 @@ class GameweekPlan:
     transfers_used: str  # e.g., "1 / 3"
     bank: str  # e.g., "1.5"
     transfers: list[Transfer] = field(default_factory=list)
+    gw_num: int = 0  # e.g., 17, used to sort plans
 
 
 @dataclass
@@ -39,149 +161,166 @@ class SolveResults:
     gameweek_plans: list[GameweekPlan] = field(default_factory=list)
 
 
-def parse_results_html(html_content: str) -> SolveResults:
+def parse_results_html(html_content: str | bytes) -> SolveResults:
     """Parse the Solio results HTML and extract transfer recommendations.
 
     Args:
-        html_content: Raw HTML content from the results page.
+        html_content: Raw HTML content from the results page, either text or
+            UTF-8 bytes (bytes are handed to the parser without decoding).
 
     Returns:
         SolveResults object containing all parsed data.
     """
-    soup = BeautifulSoup(html_content, "html.parser")
+    # Naming the encoding skips bs4's charset detection for byte input
+    encoding = "utf-8" if isinstance(html_content, bytes) else None
+    soup = BeautifulSoup(
+        html_content, _HTML_PARSER, parse_only=_RESULTS_STRAINER, from_encoding=encoding
+    )
 
-    # Parse total points and summary from evaluation node
-    total_points = 0.0
-    total_transfers = 0
-    final_bank = 0.0
+    # Collect the raw texts, then convert them to SolveResults in one place
+    fields: dict[str, Any] = {"points": None, "summary": [], "plans": []}
 
-    eval_node = soup.find("div", class_=lambda x: bool(x and "evaluationNode" in x))
+    eval_node = soup.find("div", class_=_EVALUATION_NODE_CLASS)
     if eval_node:
         # Look for total points (e.g., "639.6 pts")
         pts_span = eval_node.find("span", {"class": "text-2xl"})
         if pts_span:
-            pts_text = pts_span.get_text(strip=True)
-            try:
-                total_points = float(pts_text)
-            except ValueError:
-                pass
-
-        # Look for transfer count and bank in the summary
-        summary_ps = eval_node.find_all("p", {"class": "flex"})
-        for p in summary_ps:
-            text = p.get_text(strip=True)
-            # Bank value (e.g., "0.1")
-            if "pound-sterling" in str(p):
-                match = re.search(r"[\d.]+", text)
-                if match:
-                    try:
-                        final_bank = float(match.group())
-                    except ValueError:
-                        pass
-            # Transfer count (e.g., "10")
-            elif "arrow-left-right" in str(p):
-                match = re.search(r"\d+", text)
-                if match:
-                    try:
-                        total_transfers = int(match.group())
-                    except ValueError:
-                        pass
+            fields["points"] = pts_span.get_text(strip=True)
 
-    # Parse individual gameweek plans
-    gameweek_plans = []
-    plan_nodes = soup.find_all("div", class_=lambda x: bool(x and "planNode" in x))
+        # Transfer count and bank rows, told apart by their lucide icon class
+        for p in eval_node.find_all("p", {"class": "flex"}):
+            svg = p.find("svg")
+            if svg:
+                icon = " ".join(svg.get("class", []))
+                fields["summary"].append((icon, p.get_text(strip=True)))
 
-    for node in plan_nodes:
+    # Parse individual gameweek plans
+    for node in soup.find_all("div", class_=_PLAN_NODE_CLASS):
         # Extract gameweek (e.g., "GW17")
-        gw_elem = node.find(
-            "p", class_=lambda x: bool(x and "text-lg" in x and "font-light" in x)
-        )
+        gw_elem = node.find("p", class_=_is_gw_title)
         if not gw_elem:
             continue
-        gameweek = gw_elem.get_text(strip=True)
-
-        # Extract grade (e.g., "A-", "B+")
-        grade = ""
-        grade_elem = node.find(
-            "span",
-            class_=lambda x: bool(x and "text-2xl" in x and "font-semibold" in x),
-        )
-        if grade_elem:
-            grade = grade_elem.get_text(strip=True)
-
-        # Extract points range
-        points_range = ""
+
+        # Extract grade (e.g., "A-", "B+") and the span holding grade + points
+        grade_elem = node.find("span", class_=_is_grade)
         points_container = grade_elem.find_parent("span") if grade_elem else None
-        if points_container:
-            # Get text after the grade span (e.g., "60-73 pts")
-            full_text = points_container.get_text(strip=True)
-            # Remove the grade prefix
-            points_range = full_text.replace(grade, "").strip()
 
-        # Extract transfers used and bank
-        transfers_used = ""
-        bank = ""
-        info_ps = node.find_all("p", {"class": "flex"})
-        for p in info_ps:
-            parent_div = p.find_parent(
-                "div", class_=lambda x: bool(x and "flex" in x and "gap-2" in x)
-            )
-            if not parent_div:
-                continue
-            text = p.get_text(strip=True)
+        # Transfers used and bank rows, labelled by their icon
+        info = []
+        for p in node.select(_INFO_ROW_SELECTOR):
             svg = p.find("svg")
-            if svg:
-                aria_label = svg.get("aria-label", "")
-                if aria_label == "Transfers":
-                    transfers_used = text
-                elif aria_label == "Bank":
-                    bank = text
+            info.append((svg.get("aria-label") if svg else None, p.get_text(strip=True)))
 
         # Extract transfer recommendations (OUT -> IN)
-        transfers = []
-        transfer_div = node.find("div", class_=lambda x: bool(x and "max-w-22" in x))
+        out_players: list[str] = []
+        in_players: list[str] = []
+        transfer_div = node.find("div", class_=_TRANSFER_BLOCK_CLASS)
         if transfer_div:
             # Find OUT players (opacity-50 section)
-            out_div = transfer_div.find(
-                "div", class_=lambda x: bool(x and "opacity-50" in x)
-            )
-            out_players = []
+            out_div = transfer_div.find("div", class_=_OUT_PLAYERS_CLASS)
             if out_div:
-                for p in out_div.find_all("p"):
-                    out_players.append(p.get_text(strip=True))
+                out_players = [p.get_text(strip=True) for p in out_div.find_all("p")]
 
             # Find IN players (after the arrow, text-base section)
-            in_div = None
-            arrow = transfer_div.find(
-                "svg", class_=lambda x: bool(x and "arrow-down" in x)
-            )
-            if arrow:
-                in_div = arrow.find_next_sibling("div")
+            arrow = transfer_div.find("svg", class_=_ARROW_DOWN_CLASS)
+            in_div = arrow.find_next_sibling("div") if arrow else None
             if in_div:
-                in_players = []
-                for p in in_div.find_all("p"):
-                    in_players.append(p.get_text(strip=True))
+                in_players = [p.get_text(strip=True) for p in in_div.find_all("p")]
+
+        fields["plans"].append({
+            "gameweek": gw_elem.get_text(strip=True),
+            "grade": grade_elem.get_text(strip=True) if grade_elem else "",
+            "grade_line": points_container.get_text(strip=True) if points_container else None,
+            "info": info,
+            "out": out_players,
+            "in": in_players,
+        })
+
+    return build_results(fields)
+
+
+def build_results(fields: dict[str, Any]) -> SolveResults:
+    """Convert the raw texts collected from a results page into SolveResults.
+
+    Both parse_results_html (saved HTML) and RESULTS_EXTRACTION_JS (live page)
+    produce this shape, so number parsing and sorting only live here.
+
+    Args:
+        fields: Dict with "points" (str or None), "summary" (list of
+            [icon class, text] pairs) and "plans" (list of dicts with
+            "gameweek", "grade", "grade_line", "info" ([aria-label, text]
+            pairs), "out" and "in" player lists).
+
+    Returns:
+        SolveResults object containing all parsed data.
+    """
+    total_points = 0.0
+    total_transfers = 0
+    final_bank = 0.0
+
+    if fields["points"] is not None:
+        try:
+            total_points = float(fields["points"])
+        except ValueError:
+            pass
+
+    for icon, text in fields["summary"]:
+        # Bank value (e.g., "0.1")
+        if "pound-sterling" in icon:
+            match = _FLOAT_RE.search(text)
+            if match:
+                try:
+                    final_bank = float(match.group())
+                except ValueError:
+                    pass
+        # Transfer count (e.g., "10")
+        elif "arrow-left-right" in icon:
+            match = _INT_RE.search(text)
+            if match:
+                try:
+                    total_transfers = int(match.group())
+                except ValueError:
+                    pass
+
+    gameweek_plans = []
+    for plan_fields in fields["plans"]:
+        grade = plan_fields["grade"]
 
-                # Match OUT and IN players
-                for out_p, in_p in zip(out_players, in_players):
-                    transfers.append(Transfer(out_player=out_p, in_player=in_p))
+        # Points range is the grade span's text minus the grade (e.g., "60-73 pts")
+        points_range = ""
+        if plan_fields["grade_line"]:
+            points_range = plan_fields["grade_line"].replace(grade, "").strip()
 
-        plan = GameweekPlan(
+        transfers_used = ""
+        bank = ""
+        for aria_label, text in plan_fields["info"]:
+            if aria_label == "Transfers":
+                transfers_used = text
+            elif aria_label == "Bank":
+                bank = text
+
+        # Match OUT and IN players
+        transfers = [
+            Transfer(out_player=out_p, in_player=in_p)
+            for out_p, in_p in zip(plan_fields["out"], plan_fields["in"])
+        ]
+
+        # Gameweek number, read once here so sorting is a plain attribute lookup
+        gameweek = plan_fields["gameweek"]
+        match = _INT_RE.search(gameweek)
+
+        gameweek_plans.append(GameweekPlan(
             gameweek=gameweek,
             grade=grade,
             points_range=points_range,
             transfers_used=transfers_used,
             bank=bank,
             transfers=transfers,
-        )
-        gameweek_plans.append(plan)
+            gw_num=int(match.group()) if match else 0,
+        ))
 
     # Sort by gameweek number
-    def gw_sort_key(plan: GameweekPlan) -> int:
-        match = re.search(r"\d+", plan.gameweek)
-        return int(match.group()) if match else 0
-
-    gameweek_plans.sort(key=gw_sort_key)
+    gameweek_plans.sort(key=attrgetter("gw_num"))
 
     return SolveResults(
         total_points=total_points,
@@ -192,7 +331,11 @@ def parse_results_html(html_content: str) -> SolveResults:
 
 
 def parse_results_file(file_path: Path) -> SolveResults:
-    """Parse a saved results HTML file.
+    """Parse a saved results HTML file (plain or gzip-compressed .html.gz).
+
+    Results are cached as one pickle per file name in OUTPUT_DIR/.parse_cache,
+    stored with the file's mtime and size, so an unchanged file is only parsed
+    once and a changed one simply overwrites its entry.
 
     Args:
         file_path: Path to the HTML file.
@@ -200,9 +343,57 @@ def parse_results_file(file_path: Path) -> SolveResults:
     Returns:
         SolveResults object containing all parsed data.
     """
-    with open(file_path, "r", encoding="utf-8") as f:
-        html_content = f.read()
-    return parse_results_html(html_content)
+    from .config import PARSE_CACHE_DIR
+
+    file_path = Path(file_path)
+    st = file_path.stat()
+    cache_file = PARSE_CACHE_DIR / f"{file_path.name}.pkl"
+    fingerprint = (st.st_mtime_ns, st.st_size, _PARSE_CACHE_VERSION)
+    try:
+        with open(cache_file, "rb") as f:
+            cached_fingerprint, cached = pickle.load(f)
+        if cached_fingerprint == fingerprint:
+            return cached
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError, TypeError):
+        pass
+
+    html_bytes = file_path.read_bytes()
+    if file_path.suffix == ".gz":
+        html_bytes = gzip.decompress(html_bytes)
+    results = parse_results_html(html_bytes)
+
+    try:
+        PARSE_CACHE_DIR.mkdir(exist_ok=True)
+        with open(cache_file, "wb") as f:
+            pickle.dump((fingerprint, results), f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass  # Caching is best-effort
+    return results
+
+
+def find_latest_results_file(directory: Path) -> Path | None:
+    """Find the most recently modified results_*.html(.gz) file in a directory.
+
+    Uses a single os.scandir pass, so the directory is read once and each
+    entry is stat'ed at most once.
+
+    Args:
+        directory: Directory to search (usually OUTPUT_DIR).
+
+    Returns:
+        Path of the newest results file, or None if there are none.
+    """
+    latest_path = None
+    latest_mtime = -1.0
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if not (name.startswith("results_") and name.endswith((".html", ".html.gz"))):
+                continue
+            mtime = entry.stat().st_mtime
+            if mtime > latest_mtime:
+                latest_path, latest_mtime = entry.path, mtime
+    return Path(latest_path) if latest_path else None
 
 
 def format_results_text(results: SolveResults, settings: dict | None = None) -> str:
@@ -252,12 +443,11 @@ def main():
     from .config import OUTPUT_DIR
 
     # Find most recent results file
-    result_files = list(OUTPUT_DIR.glob("results_*.html"))
-    if not result_files:
+    latest_file = find_latest_results_file(OUTPUT_DIR)
+    if latest_file is None:
         print("No results files found in output directory.")
         return
 
-    latest_file = max(result_files, key=lambda f: f.stat().st_mtime)
     print(f"Parsing: {latest_file}")
     print()
 
@@ -1,5 +1,6 @@
 """Settings management for Solio solver configuration."""
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -7,6 +8,19 @@ import yaml
 
 from .config import PROJECT_ROOT
 
+# libyaml's C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+@lru_cache(maxsize=1)
+def _read_settings_file(settings_file: Path, mtime_ns: int) -> dict[str, Any] | None:
+    """Read and parse the settings YAML, reusing it until the file changes."""
+    with open(settings_file, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=SafeLoader)
+
 
 def load_solver_settings(verbose: bool = True) -> dict[str, Any]:
     """
@@ -28,12 +42,12 @@ def load_solver_settings(verbose: bool = True) -> dict[str, Any]:
         return get_default_settings()
     
     try:
-        with open(settings_file, "r", encoding="utf-8") as f:
-            settings = yaml.safe_load(f)
+        settings = _read_settings_file(settings_file, settings_file.stat().st_mtime_ns)
         
         if verbose:
             print(f"Loaded settings from: {settings_file}")
-        return settings or get_default_settings()
+        # Return a copy so callers can apply overrides without touching the cache
+        return dict(settings) if settings else get_default_settings()
     
     except Exception as e:
         if verbose:
@@ -1,18 +1,36 @@
 """Optimization functionality for Solio FPL."""
 
+import gzip
 import re
+import threading
 import time
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
-from playwright.sync_api import Page
+from playwright.sync_api import Locator, Page, expect
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
-from .browser import create_browser_context
+from .browser import get_browser_context
 from .config import OUTPUT_DIR
 from .login import ensure_logged_in
+from .parser import RESULTS_EXTRACTION_JS, build_results
 from .settings import load_solver_settings
 
 
+def wait_for_solver_ready(page: Page, timeout_ms: int = 30000) -> None:
+    """Wait until the solver page has rendered its Optimise button.
+
+    Solio keeps connections open, so networkidle can take the whole timeout;
+    the DOM plus the one control we need next is enough to carry on.
+    """
+    page.wait_for_load_state("domcontentloaded")
+    try:
+        page.get_by_role("button", name="Optimise").wait_for(state="visible", timeout=timeout_ms)
+    except PlaywrightTimeoutError:
+        print("Optimise button did not appear, continuing anyway...")
+
+
 def click_optimise_button(page: Page) -> bool:
     """Click the Optimise button to start the solve. Returns True if successful."""
     print("Looking for Optimise button...")
@@ -28,6 +46,46 @@ def click_optimise_button(page: Page) -> bool:
     return True
 
 
+# Horizon button label, e.g. "1 GW" or "10 GWs"
+_GW_PATTERN = re.compile(r"\d+\s+GWs?")
+
+# aria-valuemin/max/now of the matched slider, or [] when there is none
+_SLIDER_VALUES_JS = """els => els.map(el => [
+    el.getAttribute("aria-valuemin"),
+    el.getAttribute("aria-valuemax"),
+    el.getAttribute("aria-valuenow"),
+])"""
+
+# Any open settings/horizon dialog
+_DIALOG_SELECTOR = '[role="dialog"]'
+
+# Settings wheel: the icon-only button with the lucide gear icon. The absolute
+# XPath it used to be found by is kept as a fallback should the icon change.
+_SETTINGS_WHEEL_SELECTOR = 'main button:has(svg[class*="lucide-settings"])'
+_SETTINGS_WHEEL_XPATH = "/html/body/div[1]/div/main/div[1]/div/div[4]/button"
+
+
+def wait_for_state(locator: Locator, state: str = "visible", timeout: int = 2000) -> bool:
+    """Wait for a locator to reach a state. Returns False on timeout."""
+    try:
+        locator.wait_for(state=state, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+
+def _close_dialog(page: Page) -> None:
+    """Close the open dialog with Escape and wait for it to go away."""
+    page.keyboard.press("Escape")
+    wait_for_state(page.locator(_DIALOG_SELECTOR).first, "hidden")
+
+
+def _shown_horizon(horizon_button: Locator) -> int | None:
+    """Return the horizon shown on the button (e.g. 10 for "10 GWs"), if any."""
+    match = _GW_PATTERN.search(horizon_button.inner_text())
+    return int(match.group().split()[0]) if match else None
+
+
 def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
     """
     Apply solver settings from configuration before running optimization.
@@ -43,6 +101,7 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
     
     horizon_success = False
     decision_success = False
+    dialog = page.locator(_DIALOG_SELECTOR).first
     
     try:
         # Apply horizon setting (number of gameweeks to plan ahead)
@@ -52,21 +111,28 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
         # Click the horizon button to open the dialog
         # Button shows current horizon like "1 GW", "10 GWs", etc.
         # Use regex to match both singular "GW" and plural "GWs"
-        horizon_button = page.get_by_role("button").filter(has_text=re.compile(r"\d+\s+GWs?"))
-        if horizon_button.count() > 0:
+        horizon_button = page.get_by_role("button").filter(has_text=_GW_PATTERN)
+        horizon_found = horizon_button.count() > 0
+        if horizon_found and _shown_horizon(horizon_button) == horizon_weeks:
+            # The button already shows the target, no need to open the dialog
+            print(f"  Horizon already at {horizon_weeks} GWs")
+            horizon_success = True
+        elif horizon_found:
             horizon_button.click()
-            time.sleep(0.5)
+            wait_for_state(dialog)
             
             # Find the slider in the dialog
             # There might be 2 sliders: risk preference and horizon
             # Horizon slider has aria-valuemin="1" and aria-valuemax around 10
             slider = page.locator('[role="dialog"] [role="slider"][aria-valuemin="1"]').first
             
-            if slider.count() > 0:
-                # Get slider bounds
-                min_val = int(slider.get_attribute("aria-valuemin") or "1")
-                max_val = int(slider.get_attribute("aria-valuemax") or "10")
-                current_val = int(slider.get_attribute("aria-valuenow") or "10")
+            # Presence check and slider bounds in one round trip
+            slider_values = slider.evaluate_all(_SLIDER_VALUES_JS)
+            if slider_values:
+                value_min, value_max, value_now = slider_values[0]
+                min_val = int(value_min or "1")
+                max_val = int(value_max or "10")
+                current_val = int(value_now or "10")
                 
                 # Clamp horizon_weeks to valid range
                 target_val = max(min_val, min(horizon_weeks, max_val))
@@ -76,20 +142,29 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
                     
                     # Focus on the slider
                     slider.focus()
-                    time.sleep(0.2)
-                    
-                    # Use keyboard to set the value
-                    # Press Home to go to minimum, then use arrow keys
-                    page.keyboard.press("Home")
-                    time.sleep(0.2)
                     
-                    # Each arrow key press increments by 1
-                    steps = target_val - min_val
-                    for _ in range(steps):
-                        page.keyboard.press("ArrowRight")
-                        time.sleep(0.05)
+                    # Use keyboard to set the value, stepping with the arrow
+                    # keys from whichever of Home, End or the current value is
+                    # nearest to the target (each arrow press moves by 1)
+                    starts = [
+                        (abs(target_val - current_val), None, current_val),
+                        (1 + target_val - min_val, "Home", min_val),
+                        (1 + max_val - target_val, "End", max_val),
+                    ]
+                    _, start_key, start_val = min(starts, key=lambda start: start[0])
+                    if start_key:
+                        page.keyboard.press(start_key)
+                    step_key = "ArrowRight" if target_val > start_val else "ArrowLeft"
+                    for _ in range(abs(target_val - start_val)):
+                        page.keyboard.press(step_key)
                     
-                    time.sleep(0.3)
+                    # Give the slider a moment to re-render, then verify
+                    try:
+                        expect(slider).to_have_attribute(
+                            "aria-valuenow", str(target_val), timeout=1000
+                        )
+                    except AssertionError:
+                        pass
                     
                     # Verify the change
                     new_val = int(slider.get_attribute("aria-valuenow") or str(current_val))
@@ -100,11 +175,10 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
                     horizon_success = True
                     
                 # Close dialog
-                page.keyboard.press("Escape")
-                time.sleep(0.5)
+                _close_dialog(page)
             else:
                 print("  Horizon slider not found in dialog")
-                page.keyboard.press("Escape")
+                _close_dialog(page)
         else:
             print("  Horizon button not found")
         
@@ -113,24 +187,24 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
         print(f"\nSetting decision disruption probability to {decision_prob:.0%}...")
         
         # Open Settings dialog via settings wheel button
-        settings_wheel_xpath = '/html/body/div[1]/div/main/div[1]/div/div[4]/button'
-        settings_wheel = page.locator(f'xpath={settings_wheel_xpath}')
+        settings_wheel = page.locator(_SETTINGS_WHEEL_SELECTOR).or_(
+            page.locator(f"xpath={_SETTINGS_WHEEL_XPATH}")
+        ).first
         
         if settings_wheel.count() > 0:
             settings_wheel.click()
-            time.sleep(0.5)
+            wait_for_state(dialog)
             
             # Click "Settings" button in the opened dialog
             settings_button = page.get_by_role('button', name='Settings')
             if settings_button.is_visible():
                 settings_button.click()
-                time.sleep(0.5)
                 
                 # Click "Optimisation" tab
                 optimisation_tab = page.locator('button[role="tab"]:has-text("Optimisation")')
+                wait_for_state(optimisation_tab.first)
                 if optimisation_tab.count() > 0:
                     optimisation_tab.click()
-                    time.sleep(0.5)
                     
                     # Map probability to preset button
                     presets = {
@@ -149,23 +223,22 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
                     
                     # Click the preset button
                     preset_button = page.locator(f'button:has-text("{preset_name}")')
+                    wait_for_state(preset_button.first)
                     if preset_button.count() > 0:
                         preset_button.click()
-                        time.sleep(0.3)
                         print(f"  Set decision disruption to {closest_value:.0%}")
                         decision_success = True
                     else:
                         print(f"  Preset button '{preset_name}' not found")
                         
                     # Close settings dialog
-                    page.keyboard.press("Escape")
-                    time.sleep(0.5)
+                    _close_dialog(page)
                 else:
                     print("  Optimisation tab not found")
-                    page.keyboard.press("Escape")
+                    _close_dialog(page)
             else:
                 print("  Settings button not found in dialog")
-                page.keyboard.press("Escape")
+                _close_dialog(page)
         else:
             print("  Settings wheel button not found")
         
@@ -179,6 +252,12 @@ def apply_solver_settings(page: Page, settings: dict[str, Any]) -> bool:
         return False
 
 
+def _report_progress(done: threading.Event, started: float, interval: float = 5.0) -> None:
+    """Print the elapsed solve time every interval seconds until done is set."""
+    while not done.wait(interval):
+        print(f"  Waiting for results... ({int(time.monotonic() - started)}s elapsed)")
+
+
 def wait_for_solve_completion(page: Page, timeout_seconds: int = 300) -> bool:
     """
     Wait for the optimization solve to complete.
@@ -186,28 +265,36 @@ def wait_for_solve_completion(page: Page, timeout_seconds: int = 300) -> bool:
     """
     print(f"Waiting for solve to complete (timeout: {timeout_seconds}s)...")
 
-    start_time = time.time()
-
-    while time.time() - start_time < timeout_seconds:
-        # Check if "Preview Result" appears (indicates solve is complete)
-        preview_result = page.locator('text="Preview Result"')
-        if preview_result.is_visible():
-            print("Preview Result found! Solve complete.")
-            return True
-
-        elapsed = int(time.time() - start_time)
-        print(f"  Waiting for results... ({elapsed}s elapsed)")
-        time.sleep(5)  # Check every 5 seconds
+    # The "Preview Result" button appears once the solve is complete; wait_for
+    # returns as soon as it is visible instead of polling on a fixed interval.
+    # A role lookup avoids the text= engine scanning every text node.
+    preview_result = page.get_by_role("button", name="Preview Result", exact=True)
+
+    # Progress output only; the thread never touches the (thread-bound) page
+    done = threading.Event()
+    progress = threading.Thread(
+        target=_report_progress, args=(done, time.monotonic()), daemon=True
+    )
+    progress.start()
+    try:
+        preview_result.wait_for(state="visible", timeout=timeout_seconds * 1000)
+    except PlaywrightTimeoutError:
+        print("Solve timed out!")
+        return False
+    finally:
+        done.set()
+        progress.join()
 
-    print("Solve timed out!")
-    return False
+    print("Preview Result found! Solve complete.")
+    return True
 
 
 def run_solve_on_page(
     page: Page,
     timeout_seconds: int = 300,
     apply_settings: bool = True,
-    settings_overrides: dict | None = None
+    settings_overrides: dict | None = None,
+    capture_html: bool = True,
 ) -> dict | None:
     """
     Run the optimization solve on an existing page.
@@ -217,13 +304,13 @@ def run_solve_on_page(
         timeout_seconds: Maximum time to wait for solve completion.
         apply_settings: Whether to apply settings from solver_settings.yaml
         settings_overrides: Optional dict to override specific settings from CLI
+        capture_html: Save the results page HTML to OUTPUT_DIR (see fetch_results)
 
     Returns:
         Results dictionary with output_file path, or None if failed.
     """
-    # Wait for page to fully load
-    page.wait_for_load_state("networkidle", timeout=30000)
-    time.sleep(2)
+    # Wait for the solver UI to be ready
+    wait_for_solver_ready(page)
 
     # Apply settings if requested
     actual_settings = None
@@ -254,71 +341,109 @@ def run_solve_on_page(
         # Still try to fetch whatever results are available
 
     # Fetch and return results
-    results = fetch_results(page)
+    results = fetch_results(page, capture_html=capture_html)
     if actual_settings:
         results["settings"] = actual_settings
     return results
 
 
-def fetch_results(page: Page) -> dict:
+def _write_gzip(path: Path, data: bytes) -> None:
+    """Write data gzip-compressed; level 1 keeps the CPU cost well under the I/O saved."""
+    path.write_bytes(gzip.compress(data, compresslevel=1))
+
+
+def fetch_results(page: Page, capture_html: bool = True) -> dict:
     """
     Fetch the optimization results from the page.
     Returns a dictionary with the results.
+
+    With capture_html=False the page HTML is only saved if the results could
+    not be read from the live page; output_file is None otherwise.
     """
     print("Fetching results...")
 
     results = {
         "timestamp": datetime.now().isoformat(),
         "transfers": [],
-        "html": "",
         "settings": None,  # Will be set by run_solve_on_page
     }
 
-    # Wait for page to be stable
-    page.wait_for_load_state("networkidle", timeout=10000)
-    time.sleep(2)
+    # Wait for the results summary to render
+    try:
+        page.locator('div[class*="evaluationNode"]').first.wait_for(state="visible", timeout=10000)
+    except PlaywrightTimeoutError:
+        print("Results summary not found, saving the page as it is...")
+
+    # The page is read directly below, so let any loading indicator clear first
+    try:
+        page.locator('[aria-busy="true"], .animate-spin').first.wait_for(
+            state="hidden", timeout=5000
+        )
+    except PlaywrightTimeoutError:
+        print("Results still loading, reading them anyway...")
 
-    # Capture the full HTML for reference
-    results["html"] = page.content()
+    # Read the results straight from the live DOM, no HTML round trip
+    try:
+        results["parsed"] = build_results(page.evaluate(RESULTS_EXTRACTION_JS))
+    except Exception as e:
+        print(f"Error reading results from the page, will parse the saved HTML: {e}")
+
+    # Save the full HTML; it is not kept in the results dict. When the results
+    # were already read it is only a debug artifact, skipped unless capture_html.
+    # output_file is only set once the file is fully written.
+    results["output_file"] = None
+    if "parsed" in results and not capture_html:
+        print("Skipping results HTML capture")
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_file = OUTPUT_DIR / f"results_{timestamp}.html.gz"
+        html_bytes = page.content().encode("utf-8")
+        try:
+            _write_gzip(output_file, html_bytes)
+        except OSError as e:
+            print(f"Error saving results HTML to {output_file}: {e}")
+        else:
+            # Size of the saved (compressed) file, as it is on disk
+            results["html_size"] = output_file.stat().st_size
+            print(
+                f"Saved results HTML (gzip) to: {output_file} "
+                f"({results['html_size'] // 1024} KB)"
+            )
+            results["output_file"] = output_file
 
     # Try to extract transfer information
     # This will depend on how results are displayed - adjust selectors as needed
     try:
-        # Look for transfer-related elements
+        # Read both lists in one round trip instead of one per element
         # Common patterns: player names with "OUT" and "IN" indicators
-        transfer_elements = page.locator("[data-transfer]").all()
-        if transfer_elements:
-            for elem in transfer_elements:
-                results["transfers"].append(elem.text_content())
-
-        # Alternative: try to find player names in results
-        player_elements = page.locator('.player-name, [class*="player"]').all()
-        if player_elements:
-            results["players"] = [
-                elem.text_content() for elem in player_elements[:20]
-            ]  # Limit to 20
+        extracted = page.evaluate("""() => ({
+            transfers: [...document.querySelectorAll('[data-transfer]')]
+                .map(el => el.textContent),
+            // Alternative: player names in results (limit to 20)
+            players: [...document.querySelectorAll('.player-name, [class*="player"]')]
+                .slice(0, 20)
+                .map(el => el.textContent),
+        })""")
+        results["transfers"].extend(extracted["transfers"])
+        if extracted["players"]:
+            results["players"] = extracted["players"]
 
     except Exception as e:
         print(f"Error extracting detailed results: {e}")
 
-    # Save HTML to file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = OUTPUT_DIR / f"results_{timestamp}.html"
-    output_file.write_text(results["html"], encoding="utf-8")
-    print(f"Saved results HTML to: {output_file}")
-
-    results["output_file"] = output_file
     return results
 
 
-def run_solve() -> dict | None:
+def run_solve(capture_html: bool = True) -> dict | None:
     """
     Run the full optimization solve process.
     Returns the results dictionary or None if failed.
     """
     print("Starting Solio CLI - Optimization...")
 
-    p, context = create_browser_context(headless=True)
+    # The browser is shared across calls in this process; each solve only
+    # gets its own page
+    _, context = get_browser_context(headless=True, block_assets=True)
     page = context.new_page()
 
     try:
@@ -327,28 +452,11 @@ def run_solve() -> dict | None:
             print("Failed to log in")
             return None
 
-        # Wait for page to fully load
-        page.wait_for_load_state("networkidle", timeout=30000)
-        time.sleep(2)
-
-        # Apply settings
-        settings = load_solver_settings()
-        apply_solver_settings(page, settings)
-        timeout = settings.get("timeout", 300)
-
-        # Click the Optimise button
-        if not click_optimise_button(page):
-            print("Failed to click Optimise button")
+        # Same settings -> Optimise -> wait -> fetch flow as the CLI
+        results = run_solve_on_page(page, capture_html=capture_html)
+        if results is None:
             return None
 
-        # Wait for solve to complete
-        if not wait_for_solve_completion(page, timeout_seconds=timeout):
-            print("Solve did not complete in time")
-            # Still try to fetch whatever results are available
-
-        # Fetch and return results
-        results = fetch_results(page)
-
         print("Solve completed successfully!")
         return results
 
@@ -356,8 +464,7 @@ def run_solve() -> dict | None:
         print(f"Error during solve: {e}")
         return None
     finally:
-        context.close()
-        p.stop()
+        page.close()
 
 
 def main():
@@ -0,0 +1,82 @@
+"""Tests for the session cookie guard in the login flow."""
+
+import time
+
+from solio_autosolve import login
+
+
+class FakeContext:
+    """BrowserContext stand-in that only serves cookies."""
+
+    def __init__(self, cookies):
+        self._cookies = cookies
+
+    def cookies(self):
+        return self._cookies
+
+
+class FakePage:
+    """Page stand-in that records navigation."""
+
+    def __init__(self):
+        self.visited = []
+
+    def goto(self, url):
+        self.visited.append(url)
+
+
+def _cookie(name="session", domain=".solioanalytics.com", expires=None):
+    if expires is None:
+        expires = time.time() + 3600
+    return {"name": name, "domain": domain, "expires": expires}
+
+
+def test_live_session_cookie_is_detected():
+    assert login.has_session_cookie(FakeContext([_cookie()]))
+
+
+def test_browser_session_cookie_is_detected():
+    assert login.has_session_cookie(FakeContext([_cookie(expires=-1)]))
+
+
+def test_expired_or_foreign_cookies_are_ignored():
+    context = FakeContext([
+        _cookie(expires=time.time() - 60),
+        _cookie(domain=".example.com"),
+        _cookie(name="other"),
+    ])
+    assert not login.has_session_cookie(context)
+
+
+def test_cookie_shortens_but_does_not_skip_the_check(monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(
+        login, "is_logged_in", lambda page, timeout: timeouts.append(timeout) or True
+    )
+    page = FakePage()
+
+    assert login.ensure_logged_in(page, FakeContext([_cookie()]))
+    assert page.visited == [login.SOLIO_URL]
+    assert timeouts == [login.DIALOG_TIMEOUT_WITH_COOKIE_MS]
+
+
+def test_cookie_rejected_by_server_falls_back_to_login(monkeypatch):
+    monkeypatch.setattr(login, "is_logged_in", lambda page, timeout: False)
+    attempts = []
+    monkeypatch.setattr(
+        login, "login_to_solio", lambda page, context: attempts.append(page) or True
+    )
+    page = FakePage()
+
+    assert login.ensure_logged_in(page, FakeContext([_cookie()]))
+    assert attempts == [page]
+
+
+def test_no_cookie_uses_the_full_dialog_wait(monkeypatch):
+    timeouts = []
+    monkeypatch.setattr(
+        login, "is_logged_in", lambda page, timeout: timeouts.append(timeout) or True
+    )
+
+    assert login.ensure_logged_in(FakePage(), FakeContext([]))
+    assert timeouts == [login.DIALOG_TIMEOUT_MS]